@@ -1,5 +1,6 @@
 import keyword
 import re
+from functools import lru_cache
 
 
 # Word delimiters and symbols that will not be preserved when re-casing.
@@ -14,6 +15,10 @@ WORD = "[A-Z]*[a-z]*[0-9]*"
 # language=PythonRegExp
 WORD_UPPER = "[A-Z]+(?![a-z])[0-9]*"
 
+# Compiled once, these are applied to every message, field and method name.
+SNAKE_CASE_PATTERN = re.compile(f"(^)?({SYMBOLS})({WORD_UPPER}|{WORD})")
+PASCAL_CASE_PATTERN = re.compile(f"({SYMBOLS})({WORD_UPPER}|{WORD})")
+
 
 def safe_snake_case(value: str) -> str:
     """Snake case a value taking into account Python keywords."""
@@ -22,6 +27,7 @@ def safe_snake_case(value: str) -> str:
     return value
 
 
+@lru_cache(maxsize=1024)
 def snake_case(value: str, strict: bool = True) -> str:
     """
     Join words with an underscore into lowercase and remove symbols.
@@ -55,8 +61,7 @@ def snake_case(value: str, strict: bool = True) -> str:
 
         return ("_" * delimiter_count) + word.lower()
 
-    snake = re.sub(
-        f"(^)?({SYMBOLS})({WORD_UPPER}|{WORD})",
+    snake = SNAKE_CASE_PATTERN.sub(
         lambda groups: substitute_word(groups[2], groups[3], groups[1] is not None),
         value,
     )
@@ -80,7 +85,7 @@ def pascal_case(value: str, strict: bool = True) -> str:
         The value in PascalCase.
     """
 
-    def substitute_word(symbols, word):
+    def substitute_word(symbols: str, word: str) -> str:
         if strict:
             return word.capitalize()  # Remove all delimiters
 
@@ -91,8 +96,7 @@ def pascal_case(value: str, strict: bool = True) -> str:
 
         return ("_" * delimiter_length) + word.capitalize()
 
-    return re.sub(
-        f"({SYMBOLS})({WORD_UPPER}|{WORD})",
+    return PASCAL_CASE_PATTERN.sub(
         lambda groups: substitute_word(groups[1], groups[2]),
         value,
     )
@@ -1,7 +1,9 @@
 import os
 import re
+from functools import lru_cache
 from typing import (
     Dict,
+    FrozenSet,
     List,
     Set,
     Tuple,
@@ -43,12 +45,35 @@ def parse_source_type_name(field_type_name: str) -> Tuple[str, str]:
 
 
 def get_type_reference(
-    *, package: str, imports: set, source_type: str, unwrap: bool = True
+    *, package: str, imports: Set[str], source_type: str, unwrap: bool = True
 ) -> str:
     """
     Return a Python type name for a proto type reference. Adds the import if
     necessary. Unwraps well known type if required.
     """
+    py_type, type_imports = _resolve_type_reference(package, source_type, unwrap)
+    imports.update(type_imports)
+    return py_type
+
+
+@lru_cache(maxsize=None)
+def _resolve_type_reference(
+    package: str, source_type: str, unwrap: bool
+) -> Tuple[str, FrozenSet[str]]:
+    """
+    Resolve a proto type reference to a Python type name and the imports it needs.
+    The same types are referenced many times, so results are cached.
+    """
+    imports: Set[str] = set()
+    py_type = _get_type_reference(
+        package=package, imports=imports, source_type=source_type, unwrap=unwrap
+    )
+    return py_type, frozenset(imports)
+
+
+def _get_type_reference(
+    *, package: str, imports: Set[str], source_type: str, unwrap: bool
+) -> str:
     if unwrap:
         if source_type in WRAPPER_TYPES:
             wrapped_type = type(WRAPPER_TYPES[source_type]().value)
@@ -20,17 +20,20 @@ except ImportError as err:
 from .models import OutputTemplate
 
 
-def outputfile_compiler(output_file: OutputTemplate) -> str:
+templates_folder = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "templates")
+)
 
-    templates_folder = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "..", "templates")
-    )
+# Shared by all output files, so templates are parsed once per process
+env = jinja2.Environment(
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    loader=jinja2.FileSystemLoader(templates_folder),
+)
 
-    env = jinja2.Environment(
-        trim_blocks=True,
-        lstrip_blocks=True,
-        loader=jinja2.FileSystemLoader(templates_folder),
-    )
+
+def outputfile_compiler(output_file: OutputTemplate) -> str:
     template = env.get_template("template.py.j2")
 
     code = template.render(output_file=output_file)
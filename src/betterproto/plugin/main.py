@@ -30,11 +30,9 @@ def main() -> None:
     # Generate code
     response = generate_code(request)
 
-    # Serialise response message
-    output = response.SerializeToString()
-
-    # Write to stdout
-    sys.stdout.buffer.write(output)
+    # Serialise response message and write it to stdout
+    sys.stdout.buffer.write(response.SerializeToString())
+    sys.stdout.buffer.flush()
 
 
 def dump_request(dump_file: str, request: CodeGeneratorRequest) -> None:
@@ -42,8 +42,10 @@ from typing import (
     Iterable,
     Iterator,
     List,
+    NamedTuple,
     Optional,
     Set,
+    Tuple,
     Type,
     Union,
 )
@@ -69,6 +71,7 @@ from betterproto.lib.google.protobuf import (
     FieldDescriptorProtoType,
     FileDescriptorProto,
     MethodDescriptorProto,
+    ServiceDescriptorProto,
 )
 from betterproto.lib.google.protobuf.compiler import CodeGeneratorRequest
 
@@ -113,24 +116,51 @@ PROTO_MESSAGE_TYPES = (
     FieldDescriptorProtoType.TYPE_ENUM,  # 14
 )
 PROTO_MAP_TYPES = (FieldDescriptorProtoType.TYPE_MESSAGE,)  # 11
-PROTO_PACKED_TYPES = (
-    FieldDescriptorProtoType.TYPE_DOUBLE,  # 1
-    FieldDescriptorProtoType.TYPE_FLOAT,  # 2
-    FieldDescriptorProtoType.TYPE_INT64,  # 3
-    FieldDescriptorProtoType.TYPE_UINT64,  # 4
-    FieldDescriptorProtoType.TYPE_INT32,  # 5
-    FieldDescriptorProtoType.TYPE_FIXED64,  # 6
-    FieldDescriptorProtoType.TYPE_FIXED32,  # 7
-    FieldDescriptorProtoType.TYPE_BOOL,  # 8
-    FieldDescriptorProtoType.TYPE_UINT32,  # 13
-    FieldDescriptorProtoType.TYPE_SFIXED32,  # 15
-    FieldDescriptorProtoType.TYPE_SFIXED64,  # 16
-    FieldDescriptorProtoType.TYPE_SINT32,  # 17
-    FieldDescriptorProtoType.TYPE_SINT64,  # 18
+# Enum names of proto types (e.g. TYPE_INT32) and the betterproto field type
+# they correspond to (e.g. int32)
+PROTO_TYPE_NAMES: Dict[int, str] = {
+    proto_type: proto_type.name for proto_type in FieldDescriptorProtoType
+}
+PROTO_FIELD_TYPES: Dict[int, str] = {
+    proto_type: name.lower().replace("type_", "")
+    for proto_type, name in PROTO_TYPE_NAMES.items()
+}
+# Python type of each scalar proto type, message and enum types are resolved by name
+PROTO_PY_TYPES: Dict[int, str] = {
+    **dict.fromkeys(PROTO_FLOAT_TYPES, "float"),
+    **dict.fromkeys(PROTO_INT_TYPES, "int"),
+    **dict.fromkeys(PROTO_BOOL_TYPES, "bool"),
+    **dict.fromkeys(PROTO_STR_TYPES, "str"),
+    **dict.fromkeys(PROTO_BYTES_TYPES, "bytes"),
+}
+# Python representation of the default value of each scalar proto type
+PROTO_DEFAULT_VALUES: Dict[int, str] = {
+    **dict.fromkeys(PROTO_FLOAT_TYPES, "0.0"),
+    **dict.fromkeys(PROTO_INT_TYPES, "0"),
+    **dict.fromkeys(PROTO_BOOL_TYPES, "False"),
+    **dict.fromkeys(PROTO_STR_TYPES, '""'),
+    **dict.fromkeys(PROTO_BYTES_TYPES, 'b""'),
+}
+PROTO_PACKED_TYPES = frozenset(
+    {
+        FieldDescriptorProtoType.TYPE_DOUBLE,  # 1
+        FieldDescriptorProtoType.TYPE_FLOAT,  # 2
+        FieldDescriptorProtoType.TYPE_INT64,  # 3
+        FieldDescriptorProtoType.TYPE_UINT64,  # 4
+        FieldDescriptorProtoType.TYPE_INT32,  # 5
+        FieldDescriptorProtoType.TYPE_FIXED64,  # 6
+        FieldDescriptorProtoType.TYPE_FIXED32,  # 7
+        FieldDescriptorProtoType.TYPE_BOOL,  # 8
+        FieldDescriptorProtoType.TYPE_UINT32,  # 13
+        FieldDescriptorProtoType.TYPE_SFIXED32,  # 15
+        FieldDescriptorProtoType.TYPE_SFIXED64,  # 16
+        FieldDescriptorProtoType.TYPE_SINT32,  # 17
+        FieldDescriptorProtoType.TYPE_SINT64,  # 18
+    }
 )
 
 
-def monkey_patch_oneof_index():
+def monkey_patch_oneof_index() -> None:
     """
     The compiler message types are written for proto2, but we read them as proto3.
     For this to work in the case of the oneof_index fields, which depend on being able
@@ -151,32 +181,48 @@ def monkey_patch_oneof_index():
     )
 
 
-def get_comment(
-    proto_file: "FileDescriptorProto", path: List[int], indent: int = 4
-) -> str:
-    pad = " " * indent
+def get_comment_index(proto_file: "FileDescriptorProto") -> Dict[Tuple[int, ...], str]:
+    """Index the leading comments of a proto file by their source location path."""
+    index: Dict[Tuple[int, ...], str] = {}
     for sci_loc in proto_file.source_code_info.location:
-        if list(sci_loc.path) == path and sci_loc.leading_comments:
-            lines = textwrap.wrap(
-                sci_loc.leading_comments.strip().replace("\n", ""), width=79 - indent
-            )
+        # Fields of the descriptor messages are read through
+        # Message.__getattribute__, so read each one only once
+        leading_comments = sci_loc.leading_comments
+        if leading_comments:
+            index.setdefault(tuple(sci_loc.path), leading_comments)
+    return index
 
-            # This is a field, message, enum, service, or method
-            if len(lines) == 1 and len(lines[0]) < 79 - indent - 6:
-                lines[0] = lines[0].strip('"')
-                return f'{pad}"""{lines[0]}"""'
-            else:
-                joined = f"\n{pad}".join(lines)
-                return f'{pad}"""\n{pad}{joined}\n{pad}"""'
 
-    return ""
+def get_comment(
+    comments: Dict[Tuple[int, ...], str], path: Tuple[int, ...], indent: int = 4
+) -> str:
+    leading_comments = comments.get(path)
+    if not leading_comments:
+        return ""
+
+    pad = " " * indent
+    text = leading_comments.strip().replace("\n", "")
+    # Short comments without tabs or other special whitespace are what textwrap
+    # would leave untouched on a single line, so skip wrapping them.
+    if text and len(text) < 79 - indent - 6 and text.isprintable():
+        lines = [text]
+    else:
+        lines = textwrap.wrap(text, width=79 - indent)
+
+    # This is a field, message, enum, service, or method
+    if len(lines) == 1 and len(lines[0]) < 79 - indent - 6:
+        lines[0] = lines[0].strip('"')
+        return f'{pad}"""{lines[0]}"""'
+    else:
+        joined = f"\n{pad}".join(lines)
+        return f'{pad}"""\n{pad}{joined}\n{pad}"""'
 
 
 class ProtoContentBase:
     """Methods common to MessageCompiler, ServiceCompiler and ServiceMethodCompiler."""
 
     source_file: FileDescriptorProto
-    path: List[int]
+    path: Tuple[int, ...]
     comment_indent: int = 4
     parent: Union["betterproto.Message", "OutputTemplate"]
 
@@ -208,7 +254,9 @@ class ProtoContentBase:
         for this object.
         """
         return get_comment(
-            proto_file=self.source_file, path=self.path, indent=self.comment_indent
+            comments=self.request.get_comment_index(self.source_file),
+            path=self.path,
+            indent=self.comment_indent,
         )
 
 
@@ -217,6 +265,10 @@ class PluginRequestCompiler:
 
     plugin_request_obj: CodeGeneratorRequest
     output_packages: Dict[str, "OutputTemplate"] = field(default_factory=dict)
+    comment_indexes: Dict[str, Dict[Tuple[int, ...], str]] = field(default_factory=dict)
+    messages_by_name: Dict[Tuple[str, str], "MessageCompiler"] = field(
+        default_factory=dict
+    )
 
     @property
     def all_messages(self) -> List["MessageCompiler"]:
@@ -231,6 +283,31 @@ class PluginRequestCompiler:
             msg for output in self.output_packages.values() for msg in output.messages
         ]
 
+    def get_message(self, package: str, py_name: str) -> Optional["MessageCompiler"]:
+        """Find a message of this request by its package and Python name.
+
+        Only finds messages indexed by :meth:`index_messages`.
+        """
+        return self.messages_by_name.get((package, py_name))
+
+    def index_messages(self) -> None:
+        """Index all of the messages read so far by package and Python name."""
+        for msg in self.all_messages:
+            key = (msg.output_file.package, msg.py_name)
+            self.messages_by_name.setdefault(key, msg)
+
+    def get_comment_index(
+        self, proto_file: FileDescriptorProto
+    ) -> Dict[Tuple[int, ...], str]:
+        """Leading comments of an input file, indexed by source location path.
+
+        The index is built on first use and reused for every later lookup
+        in the same file.
+        """
+        if proto_file.name not in self.comment_indexes:
+            self.comment_indexes[proto_file.name] = get_comment_index(proto_file)
+        return self.comment_indexes[proto_file.name]
+
 
 @dataclass
 class OutputTemplate:
@@ -243,7 +320,7 @@ class OutputTemplate:
 
     parent_request: PluginRequestCompiler
     package_proto_obj: FileDescriptorProto
-    input_files: List[str] = field(default_factory=list)
+    input_files: List[FileDescriptorProto] = field(default_factory=list)
     imports: Set[str] = field(default_factory=set)
     datetime_imports: Set[str] = field(default_factory=set)
     typing_imports: Set[str] = field(default_factory=set)
@@ -293,7 +370,7 @@ class MessageCompiler(ProtoContentBase):
     source_file: FileDescriptorProto
     parent: Union["MessageCompiler", OutputTemplate] = PLACEHOLDER
     proto_obj: DescriptorProto = PLACEHOLDER
-    path: List[int] = PLACEHOLDER
+    path: Tuple[int, ...] = PLACEHOLDER
     fields: List[Union["FieldCompiler", "MessageCompiler"]] = field(
         default_factory=list
     )
@@ -335,25 +412,45 @@ class MessageCompiler(ProtoContentBase):
         return any(self.deprecated_fields)
 
 
-def is_map(
-    proto_field_obj: FieldDescriptorProto, parent_message: DescriptorProto
-) -> bool:
-    """True if proto_field_obj is a map, otherwise False."""
-    if proto_field_obj.type == FieldDescriptorProtoType.TYPE_MESSAGE:
-        if not hasattr(parent_message, "nested_type"):
-            return False
+def get_map_entries(message: DescriptorProto) -> Dict[str, DescriptorProto]:
+    """Map entry messages nested in message, keyed by their normalised name."""
+    return {
+        nested.name.replace("_", "").lower(): nested
+        for nested in message.nested_type
+        if nested.options.map_entry
+    }
+
 
+def map_entry_name(proto_field_obj: FieldDescriptorProto) -> Optional[str]:
+    """Normalised name of the map entry message proto_field_obj would use if it
+    is a map, or None if it can not be one."""
+    if proto_field_obj.type == FieldDescriptorProtoType.TYPE_MESSAGE:
         # This might be a map...
         message_type = proto_field_obj.type_name.split(".").pop().lower()
         map_entry = f"{proto_field_obj.name.replace('_', '').lower()}entry"
         if message_type == map_entry:
-            for nested in parent_message.nested_type:  # parent message
-                if (
-                    nested.name.replace("_", "").lower() == map_entry
-                    and nested.options.map_entry
-                ):
-                    return True
-    return False
+            return map_entry
+    return None
+
+
+def get_map_entry(
+    proto_field_obj: FieldDescriptorProto, map_entries: Dict[str, DescriptorProto]
+) -> Optional[DescriptorProto]:
+    """The map entry message of proto_field_obj if it is a map, otherwise None."""
+    map_entry = map_entry_name(proto_field_obj)
+    if map_entry is None:
+        return None
+    return map_entries.get(map_entry)
+
+
+def is_map(
+    proto_field_obj: FieldDescriptorProto, parent_message: DescriptorProto
+) -> bool:
+    """True if proto_field_obj is a map, otherwise False."""
+    map_entry = map_entry_name(proto_field_obj)
+    if map_entry is None or not hasattr(parent_message, "nested_type"):
+        return False
+    return map_entry in get_map_entries(parent_message)
 
 
 def is_oneof(proto_field_obj: FieldDescriptorProto) -> bool:
@@ -473,11 +570,7 @@ class FieldCompiler(MessageCompiler):
     @property
     def field_type(self) -> str:
         """String representation of proto field type."""
-        return (
-            FieldDescriptorProtoType(self.proto_obj.type)
-            .name.lower()
-            .replace("type_", "")
-        )
+        return PROTO_FIELD_TYPES[self.proto_obj.type]
 
     @property
     def default_value_string(self) -> str:
@@ -486,16 +579,9 @@ class FieldCompiler(MessageCompiler):
             return "[]"
         if self.optional:
             return "None"
-        if self.py_type == "int":
-            return "0"
-        if self.py_type == "float":
-            return "0.0"
-        elif self.py_type == "bool":
-            return "False"
-        elif self.py_type == "str":
-            return '""'
-        elif self.py_type == "bytes":
-            return 'b""'
+        default_value = PROTO_DEFAULT_VALUES.get(self.proto_obj.type)
+        if default_value is not None:
+            return default_value
         elif self.field_type == "enum":
             enum_proto_obj_name = self.proto_obj.type_name.split(".").pop()
             enum = next(
@@ -511,7 +597,7 @@ class FieldCompiler(MessageCompiler):
     @property
     def packed(self) -> bool:
         """True if the wire representation is a packed format."""
-        return self.repeated and self.proto_obj.type in PROTO_PACKED_TYPES
+        return self.proto_obj.type in PROTO_PACKED_TYPES and self.repeated
 
     @property
     def py_name(self) -> str:
@@ -526,25 +612,18 @@ class FieldCompiler(MessageCompiler):
     @property
     def py_type(self) -> str:
         """String representation of Python type."""
-        if self.proto_obj.type in PROTO_FLOAT_TYPES:
-            return "float"
-        elif self.proto_obj.type in PROTO_INT_TYPES:
-            return "int"
-        elif self.proto_obj.type in PROTO_BOOL_TYPES:
-            return "bool"
-        elif self.proto_obj.type in PROTO_STR_TYPES:
-            return "str"
-        elif self.proto_obj.type in PROTO_BYTES_TYPES:
-            return "bytes"
-        elif self.proto_obj.type in PROTO_MESSAGE_TYPES:
+        proto_type = self.proto_obj.type
+        if proto_type in PROTO_MESSAGE_TYPES:
             # Type referencing another defined Message or a named enum
             return get_type_reference(
                 package=self.output_file.package,
                 imports=self.output_file.imports,
                 source_type=self.proto_obj.type_name,
             )
-        else:
-            raise NotImplementedError(f"Unknown type {self.proto_obj.type}")
+        py_type = PROTO_PY_TYPES.get(proto_type)
+        if py_type is None:
+            raise NotImplementedError(f"Unknown type {proto_type}")
+        return py_type
 
     @property
     def annotation(self) -> str:
@@ -574,30 +653,27 @@ class MapEntryCompiler(FieldCompiler):
     py_v_type: Type = PLACEHOLDER
     proto_k_type: str = PLACEHOLDER
     proto_v_type: str = PLACEHOLDER
+    map_entry: DescriptorProto = PLACEHOLDER
 
     def __post_init__(self) -> None:
-        """Explore nested types and set k_type and v_type if unset."""
-        map_entry = f"{self.proto_obj.name.replace('_', '').lower()}entry"
-        for nested in self.parent.proto_obj.nested_type:
-            if (
-                nested.name.replace("_", "").lower() == map_entry
-                and nested.options.map_entry
-            ):
-                # Get Python types
-                self.py_k_type = FieldCompiler(
-                    source_file=self.source_file,
-                    parent=self,
-                    proto_obj=nested.field[0],  # key
-                ).py_type
-                self.py_v_type = FieldCompiler(
-                    source_file=self.source_file,
-                    parent=self,
-                    proto_obj=nested.field[1],  # value
-                ).py_type
-
-                # Get proto types
-                self.proto_k_type = FieldDescriptorProtoType(nested.field[0].type).name
-                self.proto_v_type = FieldDescriptorProtoType(nested.field[1].type).name
+        """Set k_type and v_type from the fields of the map entry message."""
+        nested = self.map_entry
+        if nested is not PLACEHOLDER:
+            # Get Python types
+            self.py_k_type = FieldCompiler(
+                source_file=self.source_file,
+                parent=self,
+                proto_obj=nested.field[0],  # key
+            ).py_type
+            self.py_v_type = FieldCompiler(
+                source_file=self.source_file,
+                parent=self,
+                proto_obj=nested.field[1],  # value
+            ).py_type
+
+            # Get proto types
+            self.proto_k_type = PROTO_TYPE_NAMES[nested.field[0].type]
+            self.proto_v_type = PROTO_TYPE_NAMES[nested.field[1].type]
         super().__post_init__()  # call FieldCompiler-> MessageCompiler __post_init__
 
     @property
@@ -624,8 +700,7 @@ class EnumDefinitionCompiler(MessageCompiler):
     proto_obj: EnumDescriptorProto = PLACEHOLDER
     entries: List["EnumDefinitionCompiler.EnumEntry"] = PLACEHOLDER
 
-    @dataclass(unsafe_hash=True)
-    class EnumEntry:
+    class EnumEntry(NamedTuple):
         """Representation of an Enum entry."""
 
         name: str
@@ -639,7 +714,8 @@ class EnumDefinitionCompiler(MessageCompiler):
                 name=sanitize_name(entry_proto_value.name),
                 value=entry_proto_value.number,
                 comment=get_comment(
-                    proto_file=self.source_file, path=self.path + [2, entry_number]
+                    comments=self.request.get_comment_index(self.source_file),
+                    path=(*self.path, 2, entry_number),
                 ),
             )
             for entry_number, entry_proto_value in enumerate(self.proto_obj.value)
@@ -658,8 +734,8 @@ class EnumDefinitionCompiler(MessageCompiler):
 @dataclass
 class ServiceCompiler(ProtoContentBase):
     parent: OutputTemplate = PLACEHOLDER
-    proto_obj: DescriptorProto = PLACEHOLDER
-    path: List[int] = PLACEHOLDER
+    proto_obj: ServiceDescriptorProto = PLACEHOLDER
+    path: Tuple[int, ...] = PLACEHOLDER
     methods: List["ServiceMethodCompiler"] = field(default_factory=list)
 
     def __post_init__(self) -> None:
@@ -682,13 +758,30 @@ class ServiceMethodCompiler(ProtoContentBase):
 
     parent: ServiceCompiler
     proto_obj: MethodDescriptorProto
-    path: List[int] = PLACEHOLDER
+    path: Tuple[int, ...] = PLACEHOLDER
     comment_indent: int = 8
+    py_input_message_type: str = field(default="", init=False)
+    py_output_message_type: str = field(default="", init=False)
 
     def __post_init__(self) -> None:
         # Add method to service
         self.parent.methods.append(self)
 
+        # Resolve the unquoted Python types of the input and output messages once,
+        # the template refers to them many times per method
+        self.py_input_message_type = get_type_reference(
+            package=self.output_file.package,
+            imports=self.output_file.imports,
+            source_type=self.proto_obj.input_type,
+            unwrap=False,
+        ).strip('"')
+        self.py_output_message_type = get_type_reference(
+            package=self.output_file.package,
+            imports=self.output_file.imports,
+            source_type=self.proto_obj.output_type,
+            unwrap=False,
+        ).strip('"')
+
         # Check for imports
         if "Optional" in self.py_output_message_type:
             self.output_file.typing_imports.add("Optional")
@@ -748,30 +841,7 @@ class ServiceMethodCompiler(ProtoContentBase):
         # Nested types are currently flattened without dots.
         # Todo: keep a fully quantified name in types, that is
         # comparable with method.input_type
-        for msg in self.request.all_messages:
-            if (
-                msg.py_name == name.replace(".", "")
-                and msg.output_file.package == package
-            ):
-                return msg
-        return None
-
-    @property
-    def py_input_message_type(self) -> str:
-        """String representation of the Python type corresponding to the
-        input message.
-
-        Returns
-        -------
-        str
-            String representation of the Python type corresponding to the input message.
-        """
-        return get_type_reference(
-            package=self.output_file.package,
-            imports=self.output_file.imports,
-            source_type=self.proto_obj.input_type,
-            unwrap=False,
-        ).strip('"')
+        return self.request.get_message(package, name.replace(".", ""))
 
     @property
     def py_input_message_param(self) -> str:
@@ -784,23 +854,6 @@ class ServiceMethodCompiler(ProtoContentBase):
         """
         return pythonize_field_name(self.py_input_message_type)
 
-    @property
-    def py_output_message_type(self) -> str:
-        """String representation of the Python type corresponding to the
-        output message.
-
-        Returns
-        -------
-        str
-            String representation of the Python type corresponding to the output message.
-        """
-        return get_type_reference(
-            package=self.output_file.package,
-            imports=self.output_file.imports,
-            source_type=self.proto_obj.output_type,
-            unwrap=False,
-        ).strip('"')
-
     @property
     def client_streaming(self) -> bool:
         return self.proto_obj.client_streaming
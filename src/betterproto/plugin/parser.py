@@ -2,6 +2,7 @@ import pathlib
 import sys
 from typing import (
     Generator,
+    Iterable,
     List,
     Set,
     Tuple,
@@ -33,7 +34,8 @@ from .models import (
     PluginRequestCompiler,
     ServiceCompiler,
     ServiceMethodCompiler,
-    is_map,
+    get_map_entries,
+    get_map_entry,
     is_oneof,
 )
 
@@ -41,29 +43,34 @@ from .models import (
 def traverse(
     proto_file: FileDescriptorProto,
 ) -> Generator[
-    Tuple[Union[EnumDescriptorProto, DescriptorProto], List[int]], None, None
+    Tuple[Union[EnumDescriptorProto, DescriptorProto], Tuple[int, ...]], None, None
 ]:
     # Todo: Keep information about nested hierarchy
-    def _traverse(
-        path: List[int],
-        items: Union[List[EnumDescriptorProto], List[DescriptorProto]],
-        prefix: str = "",
-    ) -> Generator[
-        Tuple[Union[EnumDescriptorProto, DescriptorProto], List[int]], None, None
-    ]:
-        for i, item in enumerate(items):
-            # Adjust the name since we flatten the hierarchy.
-            # Todo: don't change the name, but include full name in returned tuple
-            item.name = next_prefix = f"{prefix}_{item.name}"
-            yield item, [*path, i]
-
-            if isinstance(item, DescriptorProto):
-                # Get nested types.
-                yield from _traverse([*path, i, 4], item.enum_type, next_prefix)
-                yield from _traverse([*path, i, 3], item.nested_type, next_prefix)
-
-    yield from _traverse([5], proto_file.enum_type)
-    yield from _traverse([4], proto_file.message_type)
+    def _items(
+        path: Tuple[int, ...],
+        items: Iterable[Union[EnumDescriptorProto, DescriptorProto]],
+        prefix: str,
+    ) -> List[Tuple[Union[EnumDescriptorProto, DescriptorProto], Tuple[int, ...], str]]:
+        # Reversed, so that popping from the stack yields them in order
+        return [(item, (*path, i), prefix) for i, item in enumerate(items)][::-1]
+
+    # Depth first with an explicit stack rather than nested generators. Items are
+    # yielded before their nested types are renamed, which the consumer relies on.
+    stack = [
+        *_items((4,), proto_file.message_type, ""),
+        *_items((5,), proto_file.enum_type, ""),
+    ]
+    while stack:
+        item, path, prefix = stack.pop()
+        # Adjust the name since we flatten the hierarchy.
+        # Todo: don't change the name, but include full name in returned tuple
+        item.name = next_prefix = f"{prefix}_{item.name}"
+        yield item, path
+
+        if isinstance(item, DescriptorProto):
+            # Get nested types.
+            stack.extend(_items((*path, 3), item.nested_type, next_prefix))
+            stack.extend(_items((*path, 4), item.enum_type, next_prefix))
 
 
 def generate_code(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
@@ -105,6 +112,9 @@ def generate_code(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
                     output_package=output_package,
                 )
 
+    # Index the messages so services can look up their input messages
+    request_data.index_messages()
+
     # Read Services
     for output_package_name, output_package in request_data.output_packages.items():
         for proto_input_file in output_package.input_files:
@@ -130,16 +140,17 @@ def generate_code(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
             )
         )
 
-    # Make each output directory a package with __init__ file
+    # Make each output directory a package with __init__ file. Directories are
+    # shared by many output files, so collect them before touching the disk.
+    directories = {directory for path in output_paths for directory in path.parents}
     init_files = {
-        directory.joinpath("__init__.py")
-        for path in output_paths
-        for directory in path.parents
-        if not directory.joinpath("__init__.py").exists()
+        directory.joinpath("__init__.py") for directory in directories
     } - output_paths
+    init_files = {init_file for init_file in init_files if not init_file.exists()}
 
-    for init_file in init_files:
-        response.file.append(CodeGeneratorResponseFile(name=str(init_file)))
+    response.file.extend(
+        CodeGeneratorResponseFile(name=str(init_file)) for init_file in init_files
+    )
 
     for output_package_name in sorted(output_paths.union(init_files)):
         print(f"Writing {output_package_name}", file=sys.stderr)
@@ -148,8 +159,8 @@ def generate_code(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
 
 
 def read_protobuf_type(
-    item: DescriptorProto,
-    path: List[int],
+    item: Union[DescriptorProto, EnumDescriptorProto],
+    path: Tuple[int, ...],
     source_file: "FileDescriptorProto",
     output_package: OutputTemplate,
 ) -> None:
@@ -161,27 +172,30 @@ def read_protobuf_type(
         message_data = MessageCompiler(
             source_file=source_file, parent=output_package, proto_obj=item, path=path
         )
+        map_entries = get_map_entries(item)
         for index, field in enumerate(item.field):
-            if is_map(field, item):
+            map_entry = get_map_entry(field, map_entries)
+            if map_entry is not None:
                 MapEntryCompiler(
                     source_file=source_file,
                     parent=message_data,
                     proto_obj=field,
-                    path=path + [2, index],
+                    path=(*path, 2, index),
+                    map_entry=map_entry,
                 )
             elif is_oneof(field):
                 OneOfFieldCompiler(
                     source_file=source_file,
                     parent=message_data,
                     proto_obj=field,
-                    path=path + [2, index],
+                    path=(*path, 2, index),
                 )
             else:
                 FieldCompiler(
                     source_file=source_file,
                     parent=message_data,
                     proto_obj=field,
-                    path=path + [2, index],
+                    path=(*path, 2, index),
                 )
     elif isinstance(item, EnumDescriptorProto):
         # Enum
@@ -194,9 +208,9 @@ def read_protobuf_service(
     service: ServiceDescriptorProto, index: int, output_package: OutputTemplate
 ) -> None:
     service_data = ServiceCompiler(
-        parent=output_package, proto_obj=service, path=[6, index]
+        parent=output_package, proto_obj=service, path=(6, index)
     )
     for j, method in enumerate(service.method):
         ServiceMethodCompiler(
-            parent=service_data, proto_obj=method, path=[6, index, 2, j]
+            parent=service_data, proto_obj=method, path=(6, index, 2, j)
         )
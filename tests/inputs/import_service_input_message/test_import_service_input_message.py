@@ -1,6 +1,9 @@
+from pathlib import Path
+
 import pytest
 
 from tests.mocks import MockChannel
+from tests.output_betterproto import import_service_input_message
 from tests.output_betterproto.import_service_input_message import (
     NestedRequestMessage,
     RequestMessage,
@@ -34,3 +37,10 @@ async def test_service_correctly_imports_nested_reference():
     service = TestStub(MockChannel([mock_response]))
     response = await service.do_thing3(NestedRequestMessage(1))
     assert mock_response == response
+
+
+def test_service_imports_package_of_input_message_only_used_by_service():
+    # Importing the child module in this test already sets it as an attribute of
+    # the package, so check the generated source for the import itself.
+    source = Path(import_service_input_message.__file__).read_text()
+    assert "from . import child" in source
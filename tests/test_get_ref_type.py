@@ -259,6 +259,16 @@ def test_reference_unrelated_nested_package():
     assert name == '"__p_q__.Message"'
 
 
+def test_reference_types_from_the_same_package_share_an_import():
+    imports = set()
+    message = get_type_reference(package="a", imports=imports, source_type="p.Message")
+    other = get_type_reference(package="a", imports=imports, source_type="p.Other")
+
+    assert imports == {"from .. import p as _p__"}
+    assert message == '"_p__.Message"'
+    assert other == '"_p__.Other"'
+
+
 def test_reference_unrelated_deeply_nested_package():
     imports = set()
     name = get_type_reference(